@@ -13,14 +13,25 @@
 import logging
 import coloredlogs
 import os
+import shutil
+import sys
 from pathlib import Path
 import datetime
+import re
+import argparse
+from collections import Counter, defaultdict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from redminelib import Redmine
+from requests.adapters import HTTPAdapter, Retry
 import getpass
 import json
 
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 import keyboard
 
 # ----------------------------------------------------------------------------------------------
@@ -30,8 +41,8 @@ APP_TITLE:str = " FIDEx Tool "
 """ Title to be shown in the splash screen. """
 LINE_STYLE:str = "~"
 """ Character to be used as horizontal line style on the UI. """
-LOG_LEVEL:str = "DEBUG"
-""" Logging level to be used in the script. """
+LOG_LEVEL:str = "INFO"
+""" Logging level to be used in the script. Default is "INFO". """
 TEST_MODE:bool = False
 """ Flag to enable test mode. Default is False. """
 TEST_LENGTH:int = 2
@@ -39,25 +50,59 @@ TEST_LENGTH:int = 2
 PRJ_TO_SKIP:list = []
 """ List of project IDs to skip. Default is []. """
 # PRJ_TO_SKIP:list = [94, 123, 98, 99, 100, 101, 102, 103, 104, 105, 106, 107, 108, 109, 110, 111, 112, 113, 114, 115, 116, 117, 118, 119, 120, 121, 122]
+MAX_WORKERS:int = int(os.environ.get("FIDEX_MAX_WORKERS", 5))
+""" Maximum number of concurrent requests to the Redmine server. Default is 5, may be set by the FIDEX_MAX_WORKERS environment variable. """
+ISSUE_PAGE_SIZE:int = 100
+""" Number of issues requested per page when fetching issues. Default is 100, the maximum page size accepted by Redmine. """
+HTTP_MAX_RETRIES:int = 3
+""" Number of times a failed connection to the Redmine server is retried. Default is 3. """
+HTTP_RETRY_BACKOFF:float = 0.3
+""" Backoff factor, in seconds, of the growing delay between retries of a failed request. Default is 0.3. """
+HTTP_RETRY_STATUS:list = [502, 503, 504]
+""" HTTP status codes of temporary server errors, for which the request is retried. Default is [502, 503, 504]. """
 
 REDMINE_URL:str = "https://sistemas.anatel.gov.br/fiscaliza"
 """ URL of the Redmine server. Default is "https://sistemas.anatel.gov.br/fiscaliza". """
+REDMINE_API_KEY:str = os.environ.get("REDMINE_API_KEY")
+""" API key used to authenticate in the Redmine server, skipping the username and password prompt. Default is the REDMINE_API_KEY environment variable, if set. """
 PRJ_INSTR_GENERAL_REGISTER:str = "Cadastro-Instrumentos"
 """ Name of the project for general register. Default is "Cadastro-Instrumentos". """
 PROJECT_NAME_KEYWORD:str = "Instrumentos"
 """ Keyword to filter projects. Default is "Instrumentos". """
+PROJECT_NAME_KEYWORDS:list = [PROJECT_NAME_KEYWORD]
+""" List of keywords to filter projects, a project is selected if its name contains any of them. Default is [PROJECT_NAME_KEYWORD]. """
 GR_ISSUE_TRACKER_NAMES:list = ["Categoria de instrumento", "Tipo de instrumento", "Marca e Modelo", "Tipo de Acessório"]
 """ List of issue tracker names for the general register. Default is ["Categoria de instrumento", "Tipo de instrumento", "Marca e Modelo", "Tipo de Acessório"]. """
 EQUIPMENT_TRACKER_ID:int = 20
 """ Tracker ID for equipment issues. Default is 20. """
+GR_ISSUE_INCLUDE:list = []
+""" Associated data requested along with the general register issues. Default is [], since only the issue attributes and custom fields, always returned by Redmine, are used. """
+EQUIPMENT_ISSUE_INCLUDE:list = ["journals"]
+""" Associated data requested along with the equipment issues. Default is ["journals"], used to parse the calibration history. """
 JOURNAL_CAL_DATE_ID:str = "581"
 """ ID of the journal field for calibration date. Default is 581. """
 JOURNAL_CAL_CERT_SEI_ID:str = "583"
 """ ID of the journal field for calibration certificate SEI number. Default is 583. """
+ISSUE_BASE_COLUMNS:list = ["id", "Tipo (tracker)", "Situação (status)", "Título (subject)"]
+""" Columns parsed from every issue, placed first in the output tables. Custom field and calibration columns follow in order of appearance. """
+CATEGORICAL_COLUMNS:list = ["Tipo (tracker)", "Situação (status)"]
+""" Columns with few distinct values, stored with the pandas category dtype. """
+CATEGORICAL_MAX_UNIQUE_RATIO:float = 0.5
+""" Maximum ratio between the number of distinct values and the number of rows for other text columns to be stored with the pandas category dtype. Default is 0.5. """
 OUTPUT_FILENAME_SUFFIX:str = "instrumentos_anatel"
 """ Name of the output Excel file. Default is "redmine_data.xlsx". """
 OUTPUT_PATH:str = Path.home()
 """ Path to the output directory. Default user home folder. """
+OUTPUT_FORMAT:str = "xlsx"
+""" Format of the output, "xlsx" for a single Excel file with one sheet per table, or "csv" for one CSV file per table. Default is "xlsx". """
+CACHE_PATH:Path = Path.home() / ".cache" / "fidex"
+""" Path to the directory used to cache Redmine responses between runs. Default is ".cache/fidex" in the user home folder. """
+CACHE_READ:bool = True
+""" Flag to reuse the data cached by previous runs. When False, all data is fetched again from Redmine and the cache is refreshed. Default is True. """
+CACHE_TTL:int = 24 * 60 * 60
+""" Time, in seconds, after which cached Redmine responses are fetched again. Default is 24 hours. """
+ISSUE_CACHE_TTL:int = 7 * 24 * 60 * 60
+""" Time, in seconds, since the last full fetch after which cached issues are fetched again in full, instead of only the issues updated since the last run. Default is 7 days. """
 
 # ----------------------------------------------------------------------------------------------
 class uiTerminal:
@@ -68,7 +113,7 @@ class uiTerminal:
         
         global LINE_STYLE, APP_TITLE
         
-        self.terminal_width: str = os.get_terminal_size().columns
+        self.terminal_width: int = shutil.get_terminal_size().columns
         """ Terminal width. """
         self.app_title: str = self.draw_title(APP_TITLE)
         """ Title to be shown in the help message. """
@@ -101,15 +146,20 @@ class uiTerminal:
     # ------------------------------------------------------------------------------------------
     def get_credentials(self) -> tuple:
         """
-        Get user credentials.
+        Get user credentials. The username and password are not requested if an API key is set.
 
         :return: Tuple with username and password.
         """
         
+        global REDMINE_API_KEY
+        
         print(f"\033[90m\n{self.app_title}")
         print("\nWelcome to the Fiscaliza Instrument Data Extraction Tool!\n")
-        self.username = input("Username: ").strip()
-        self.password = getpass.getpass("Password: ").strip()
+        if REDMINE_API_KEY:
+            print("Using the configured API key.")
+        else:
+            self.username = input("Username: ").strip()
+            self.password = getpass.getpass("Password: ").strip()
         print(f"{self.line}\n\033[0m")
     
     # ------------------------------------------------------------------------------------------
@@ -175,7 +225,8 @@ class uiTerminal:
         for handler in logging.root.handlers[:]:
             logging.root.removeHandler(handler)
             
-        # Define a custom formatter for colored logging
+        # Define a custom formatter for colored logging. The handler is installed in the root logger,
+        # so all loggers (including third-party modules) use the same formatting
         coloredlogs.install(
             level=LOG_LEVEL,
             fmt=' %(asctime)s | %(levelname)8s |  %(message)s',
@@ -187,13 +238,6 @@ class uiTerminal:
                 'critical': {'color': 'red', 'bold': True}
             }
         )
-        
-        # Ensure all loggers (including third-party modules) use the same formatting
-        logging.basicConfig(
-            level=LOG_LEVEL,  # Set the minimum logging level
-            format='%(asctime)s | %(levelname)8s | %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
 
         # Set the logging level for specific modules (e.g., redminelib)
         logging.getLogger("redminelib").setLevel(LOG_LEVEL)
@@ -213,16 +257,31 @@ class uiTerminal:
         logging.debug("Configured parameters:")
         logging.debug(f"Test Mode: {TEST_MODE}")
         logging.debug(f"Test Length: {TEST_LENGTH}")
+        logging.debug(f"Max Workers: {MAX_WORKERS}")
+        logging.debug(f"Issue Page Size: {ISSUE_PAGE_SIZE}")
+        logging.debug(f"HTTP Max Retries: {HTTP_MAX_RETRIES}")
+        logging.debug(f"HTTP Retry Backoff: {HTTP_RETRY_BACKOFF}")
+        logging.debug(f"HTTP Retry Status: {HTTP_RETRY_STATUS}")
         logging.debug(f"Redmine URL: {REDMINE_URL}")
+        logging.debug(f"Redmine API Key: {'set' if REDMINE_API_KEY else 'not set'}")
         logging.debug(f"General Register Project: {PRJ_INSTR_GENERAL_REGISTER}")
         logging.debug(f"Project Name Keyword: {PROJECT_NAME_KEYWORD}")
+        logging.debug(f"Project Name Keywords: {PROJECT_NAME_KEYWORDS}")
         logging.debug(f"Projects to Skip: {PRJ_TO_SKIP}")
         logging.debug(f"General Register Issue Tracker Names: {GR_ISSUE_TRACKER_NAMES}")
         logging.debug(f"Equipment Tracker ID: {EQUIPMENT_TRACKER_ID}")
+        logging.debug(f"General Register Issue Include: {GR_ISSUE_INCLUDE}")
+        logging.debug(f"Equipment Issue Include: {EQUIPMENT_ISSUE_INCLUDE}")
         logging.debug(f"Journal Calibration Date ID: {JOURNAL_CAL_DATE_ID}")
         logging.debug(f"Journal Calibration Certificate SEI ID: {JOURNAL_CAL_CERT_SEI_ID}")
+        logging.debug(f"Categorical Max Unique Ratio: {CATEGORICAL_MAX_UNIQUE_RATIO}")
         logging.debug(f"Output Filename Suffix: {OUTPUT_FILENAME_SUFFIX}")
-        logging.debug(f"Output Path: {OUTPUT_PATH}")        
+        logging.debug(f"Output Path: {OUTPUT_PATH}")
+        logging.debug(f"Output Format: {OUTPUT_FORMAT}")
+        logging.debug(f"Cache Path: {CACHE_PATH}")
+        logging.debug(f"Cache Read: {CACHE_READ}")
+        logging.debug(f"Cache TTL: {CACHE_TTL}")
+        logging.debug(f"Issue Cache TTL: {ISSUE_CACHE_TTL}")
 
 # ----------------------------------------------------------------------------------------------
 class RedmineParser:
@@ -239,39 +298,135 @@ class RedmineParser:
         :param project_dict: Dictionary of project names and their IDs.
         :param df_dict: Dictionary of DataFrames for different trackers.
         """
-        global REDMINE_URL, GR_ISSUE_TRACKER_NAMES
+        global REDMINE_URL, REDMINE_API_KEY, MAX_WORKERS, HTTP_MAX_RETRIES, HTTP_RETRY_BACKOFF, HTTP_RETRY_STATUS
         
         self.ui: uiTerminal = ui
         """ Instance of the uiTerminal class for user interaction. """
-        self.redmine: Redmine = Redmine(REDMINE_URL, username=ui.username, password=ui.password)
+        self.redmine: Redmine = (Redmine(REDMINE_URL, key=REDMINE_API_KEY) if REDMINE_API_KEY
+                                 else Redmine(REDMINE_URL, username=ui.username, password=ui.password))
         """ Redmine object connected to the server for data retrieval. """
         self.equipment_projects_data: dict = {}
         """ Dictionary to store project IDs for different equipment projects. """
         self.gr_project_data: dict = {}
         """ Dictionary to store project IDs for general register projects. """
-        self.gr_df_dict: dict = {tracker: pd.DataFrame() for tracker in GR_ISSUE_TRACKER_NAMES}
-        """ Output dictionary of DataFrames for various parsed general register tables (associated with different trackers). """
+        self.gr_df_dict: dict = {}
+        """ Output dictionary of DataFrames for various parsed general register tables (associated with different trackers), only for trackers with issues. """
         self.instr_df: pd.DataFrame = pd.DataFrame()
         """ Output dataFrame for parsed equipment data entries (issues with equipment_TRACKER_ID). """
         self.custom_fields_codes: dict = {}
         """ Dictionary to store custom fields for the issues. """
+        self.string_pool: dict = {}
+        """ Dictionary to store a single copy of each parsed text value, since the same values recur across many issues. """
+        self.json_custom_field_cache: dict = {}
+        """ Dictionary to store the parsed value of each JSON custom field value, since the same values recur across many issues. """
+        self.near_json_fixes: dict = {'=>': ':', '"numero"': '"valor"', '19"LED': '19\\"LED'}
+        """ Replacements applied to custom field values in near JSON format, to make them valid JSON. """
+        self.near_json_pattern: re.Pattern = re.compile("|".join(re.escape(key) for key in self.near_json_fixes))
+        """ Compiled pattern matching all near JSON replacements, to apply them in a single pass. """
+        
+        # Keep one connection per worker thread alive in the shared session, so that TCP and TLS handshakes are not repeated on each request.
+        # Failed connections and temporary server errors are retried with a growing delay, returning the last response to redminelib
+        retry = Retry(total=HTTP_MAX_RETRIES, backoff_factor=HTTP_RETRY_BACKOFF, status_forcelist=HTTP_RETRY_STATUS, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS, max_retries=retry)
+        self.redmine.engine.session.mount("https://", adapter)
+        self.redmine.engine.session.mount("http://", adapter)
+        
+        # redminelib replaces the default headers of the session, requesting uncompressed responses, so compression is requested again
+        self.redmine.engine.session.headers["Accept-Encoding"] = "gzip, deflate"
+    
+    # ------------------------------------------------------------------------------------------
+    def read_cache(self, cache_name: str, ttl:int = None) -> object:
+        """
+        Reads data cached on disk by a previous run.
+
+        :param cache_name: Name of the cache entry, used as the cache file name.
+        :param ttl: Time, in seconds, after which the cache entry expires. Default is CACHE_TTL.
+        :return: Cached data, or None if there is no valid cache entry for the current Redmine server.
+        """
+        global CACHE_PATH, CACHE_READ, CACHE_TTL, REDMINE_URL
+        
+        if not CACHE_READ:
+            return None
+        
+        if ttl is None:
+            ttl = CACHE_TTL
+        
+        cache_file = CACHE_PATH / f"{cache_name}.json"
+        try:
+            if datetime.datetime.now().timestamp() - cache_file.stat().st_mtime > ttl:
+                logging.debug(f"Cache '{cache_file}' expired.")
+                return None
+            
+            with cache_file.open(encoding="utf-8") as file:
+                cache = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Failed to read cache '{cache_file}': {e}")
+            return None
+        
+        if cache.get("url") != REDMINE_URL:
+            logging.debug(f"Cache '{cache_file}' refers to another Redmine server.")
+            return None
+        
+        return cache.get("data")
+    
+    # ------------------------------------------------------------------------------------------
+    def write_cache(self, cache_name: str, data: object) -> None:
+        """
+        Writes data to the disk cache, to be reused by the next runs.
+
+        :param cache_name: Name of the cache entry, used as the cache file name.
+        :param data: JSON serializable data to be cached.
+        """
+        global CACHE_PATH, REDMINE_URL
+        
+        cache_file = CACHE_PATH / f"{cache_name}.json"
+        try:
+            CACHE_PATH.mkdir(parents=True, exist_ok=True)
+            with cache_file.open("w", encoding="utf-8") as file:
+                json.dump({"url": REDMINE_URL, "data": data}, file)
+        except OSError as e:
+            logging.warning(f"Failed to write cache '{cache_file}': {e}")
+    
+    # ------------------------------------------------------------------------------------------
+    def filter_projects(self, projects: list, keywords: list) -> dict:
+        """
+        Filters projects whose name contains any of the given keywords, using a single compiled pattern.
+
+        :param projects: List of (name, id) pairs of the projects.
+        :param keywords: List of keywords to be searched in the project names.
+        :return: Dictionary of the selected project names and their IDs, excluding the projects in PRJ_TO_SKIP.
+        """
+        global PRJ_TO_SKIP
+        
+        pattern = re.compile("|".join(map(re.escape, keywords)))
+        
+        return {name: id for name, id in projects if pattern.search(name) and id not in PRJ_TO_SKIP}
     
     # ------------------------------------------------------------------------------------------
     def fetch_projects(self) -> dict:
         """
         Fetches projects from the Redmine server and filters them based on the keyword in their name.
+        The list of projects is cached on disk, being fetched again from the server only after the cache expires.
         """
         
-        global PROJECT_NAME_KEYWORD, PRJ_INSTR_GENERAL_REGISTER, PROJECT_NAME_KEYWORD, PRJ_TO_SKIP
+        global PROJECT_NAME_KEYWORD, PROJECT_NAME_KEYWORDS, PRJ_INSTR_GENERAL_REGISTER
         
-        # Query for existing projects
-        logging.info("Fetching projects...")
-        projects = self.redmine.project.all()
+        # Query for existing projects, as (name, id) pairs
+        projects = self.read_cache("projects")
+        if projects is None:
+            logging.info("Fetching projects...")
+            projects = [(project.name, project.id) for project in self.redmine.project.all()]
+            self.write_cache("projects", projects)
+        else:
+            logging.info("Using cached list of projects.")
         
-        # Filter projects based on the keyword in their name
-        self.equipment_projects_data = {project.name: project.id for project in projects if (PROJECT_NAME_KEYWORD in project.name and project.id not in PRJ_TO_SKIP)}
+        # Filter projects based on the keywords in their name
+        self.equipment_projects_data = self.filter_projects(projects, PROJECT_NAME_KEYWORDS)
         
-        logging.debug(f"Fetched projects: {json.dumps(self.equipment_projects_data, indent=4)}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Fetched projects: {json.dumps(self.equipment_projects_data, indent=4)}")
         
         # Set up the project dictionary for the general register from the equipment project IDs
         try:
@@ -291,66 +446,296 @@ class RedmineParser:
                 exit(1)
         
         if self.equipment_projects_data:
-            logging.info(f"Found {len(self.equipment_projects_data)} projects with keyword '{PROJECT_NAME_KEYWORD}'.")
+            logging.info(f"Found {len(self.equipment_projects_data)} projects with keywords {PROJECT_NAME_KEYWORDS}.")
         else:
-            logging.warning(f"Project with keyword {PROJECT_NAME_KEYWORD} not found.")
+            logging.warning(f"Project with keywords {PROJECT_NAME_KEYWORDS} not found.")
             exit(1)
     
     # ------------------------------------------------------------------------------------------
-    def fetch_issues_by_project(self, project: dict, tracker_id:str = None, include_journals:bool = True) -> dict:
+    def fetch_tracker_ids(self, tracker_names: list) -> str:
+        """
+        Fetches the IDs of the given trackers from the Redmine server, to filter issues on the server side.
+        The list of trackers is cached on disk, being fetched again from the server only after the cache expires.
+
+        :param tracker_names: List of tracker names to be searched.
+        :return: Tracker IDs found, in the Redmine filter format for multiple values (e.g. "1|2|3"), or None if none was found.
+        """
+        
+        trackers = self.read_cache("trackers")
+        if trackers is None:
+            logging.info("Fetching trackers...")
+            try:
+                trackers = [(tracker.name, tracker.id) for tracker in self.redmine.tracker.all()]
+            except Exception as e:
+                logging.warning(f"Failed to fetch trackers, issues will be filtered locally: {e}")
+                return None
+            self.write_cache("trackers", trackers)
+        
+        tracker_ids = dict(trackers)
+        missing_trackers = [name for name in tracker_names if name not in tracker_ids]
+        if missing_trackers:
+            logging.warning(f"Trackers not found in the Redmine server: {missing_trackers}")
+        
+        found_ids = [str(tracker_ids[name]) for name in tracker_names if name in tracker_ids]
+        
+        return "|".join(found_ids) if found_ids else None
+    
+    # ------------------------------------------------------------------------------------------
+    def request_json(self, path: str, params: dict) -> dict:
         """
-        Fetches issues for a given project ID from the Redmine server.
+        Requests a Redmine REST API endpoint through the authenticated redminelib session, returning the decoded JSON response.
+        Using the engine directly skips the creation of redminelib resources for data that is only read as raw JSON.
 
-        :param project: Name and ID of the project to fetch issues from.
+        :param path: Path of the endpoint, relative to the Redmine URL, e.g. "issues.json".
+        :param params: Query parameters, where lists are joined by commas as done by redminelib.
+        :return: Decoded JSON response.
+        :raise: redminelib exceptions if the request fails, as when using the redminelib resources.
+        """
+        
+        params = {key: ",".join(value) if isinstance(value, list) else value for key, value in params.items()}
+        return self.redmine.engine.request("get", f"{self.redmine.url}/{path}", params=params)
+    
+    # ------------------------------------------------------------------------------------------
+    def fetch_issue_page(self, issue_filter_params: dict, offset: int) -> tuple:
+        """
+        Fetches a single page of issues from the Redmine server, as raw JSON data.
+
+        :param issue_filter_params: Filter parameters to be used in the issue query.
+        :param offset: Offset of the first issue of the page.
+        :return: Tuple with the list of raw issue data and the total number of issues available.
+        """
+        global ISSUE_PAGE_SIZE
+        
+        response = self.request_json("issues.json", {**issue_filter_params, "offset": offset, "limit": ISSUE_PAGE_SIZE})
+        
+        return response["issues"], response["total_count"]
+    
+    # ------------------------------------------------------------------------------------------
+    def fetch_issue_journals(self, issue_id: int) -> list:
+        """
+        Fetches the journals of a single issue from the Redmine server, since Redmine does not return them in issue lists.
+
+        :param issue_id: ID of the issue.
+        :return: List of raw journal data.
+        """
+        
+        return self.request_json(f"issues/{issue_id}.json", {"include": ["journals"]})["issue"].get("journals") or []
+    
+    # ------------------------------------------------------------------------------------------
+    def fetch_issue_watermark(self, issue_filter_params: dict) -> tuple:
+        """
+        Fetches the update time of the most recently updated issue and the number of issues matching the filter parameters,
+        requesting a single issue. Taken before the issues are fetched, the update time is a watermark from which the next run
+        requests the updated issues, since any issue changed while the pages are fetched gets a later update time.
+
+        :param issue_filter_params: Filter parameters to be used in the issue query.
+        :return: Tuple with the update time, as returned by Redmine, or an empty string if there are no issues, and the total number of issues available.
+        """
+        
+        response = self.request_json("issues.json", {**issue_filter_params, "sort": "updated_on:desc", "limit": 1})
+        updated_on = (response["issues"][0].get("updated_on") or "") if response["issues"] else ""
+        
+        return updated_on, response["total_count"]
+    
+    # ------------------------------------------------------------------------------------------
+    def build_issue_filter_params(self, project_id: int, tracker_id:str = None, include:list = None) -> dict:
+        """
+        Builds the filter parameters used to query the issues of a project.
+
+        :param project_id: ID of the project to fetch issues from.
         :param tracker_id: Tracker ID to filter issues by (optional).
-        :return: Updated project dictionary adding a list of issues, under the key 'issues'.
-        :raise: Exception if an error occurs different from AttributeError.
+        :param include: List of associated data to be requested along with the issues, e.g. ["journals"] (optional).
+        :return: Dictionary with the filter parameters.
         """
-        global TEST_MODE, TEST_LENGTH
         
-        test_mode_counter = 0
+        issue_filter_params = {
+            "project_id": project_id,
+            "status_id": "*"
+        }
+        if tracker_id:
+            issue_filter_params["tracker_id"] = tracker_id
+        if include:
+            issue_filter_params["include"] = include
+        
+        return issue_filter_params
+    
+    # ------------------------------------------------------------------------------------------
+    def fetch_raw_issues(self, filter_params: dict) -> dict:
+        """
+        Fetches the raw issue data of several projects from the Redmine server.
+        All requests, from all projects, share a single pool of worker threads. The first page of each project
+        is used to get its total number of issues, and the remaining pages are queued as soon as it is known.
+        When journals are requested, the journals of each issue are queued as soon as its page is received,
+        except for issues never updated since their creation, which have no journals.
+
+        :param filter_params: Filter parameters to be used in the issue query, by project name.
+        :return: Dictionary with the list of raw issue data, by project name, in the order returned by Redmine.
+        :raise: Exception if an error occurs while fetching the issues.
+        """
+        global MAX_WORKERS, ISSUE_PAGE_SIZE
+        
+        pages = {project_name: {} for project_name in filter_params}
+        pending = {}
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # Request the first page of every project
+            for project_name, issue_filter_params in filter_params.items():
+                logging.info("Fetching issues for project: '%s' (ID %s)...", project_name, issue_filter_params["project_id"])
+                pending[executor.submit(self.fetch_issue_page, issue_filter_params, 0)] = (project_name, 0, None)
+            
+            # Handle each request as it completes, queueing the requests that depend on it
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    project_name, offset, raw_issue = pending.pop(future)
+                    
+                    # Journal requests store their result in the raw data of the issue
+                    if raw_issue is not None:
+                        try:
+                            raw_issue["journals"] = future.result()
+                        except Exception as e:
+                            # Leave the journals unset, so they are requested again when parsed and the issue is not cached
+                            logging.warning("Error fetching journals of issue ID %s: %s", raw_issue["id"], e)
+                            raw_issue["journals"] = None
+                        continue
+                    
+                    try:
+                        page_data, total_count = future.result()
+                    except Exception as e:
+                        logging.error(f"Error fetching issues for project '{project_name}' (ID {filter_params[project_name]['project_id']}): {e}")
+                        # Cancel the queued requests, so the error is raised once the requests already running finish
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise
+                    
+                    pages[project_name][offset] = page_data
+                    
+                    if offset == 0:
+                        logging.info("Found %d issues in project: '%s' (ID %s).", total_count, project_name, filter_params[project_name]["project_id"])
+                        for page_offset in range(ISSUE_PAGE_SIZE, total_count, ISSUE_PAGE_SIZE):
+                            pending[executor.submit(self.fetch_issue_page, filter_params[project_name], page_offset)] = (project_name, page_offset, None)
+                    
+                    if "journals" in filter_params[project_name].get("include", []):
+                        for page_raw_issue in page_data:
+                            # Every change to an issue creates a journal, so issues never updated since their creation have none
+                            if page_raw_issue.get("created_on") and page_raw_issue.get("created_on") == page_raw_issue.get("updated_on"):
+                                page_raw_issue["journals"] = []
+                                continue
+                            pending[executor.submit(self.fetch_issue_journals, page_raw_issue["id"])] = (project_name, offset, page_raw_issue)
+        
+        # Merge the pages of each project in the original order
+        return {project_name: [raw_issue for offset in sorted(project_pages) for raw_issue in project_pages[offset]]
+                for project_name, project_pages in pages.items()}
+    
+    # ------------------------------------------------------------------------------------------
+    def fetch_issues_by_project(self, projects: dict, tracker_id:str = None, include:list = None, tracker_names:list = None) -> dict:
+        """
+        Fetches and parses issues for the given projects from the Redmine server.
+        The raw issues of each project are cached on disk. When a cached copy exists, only the issues updated since the
+        previous run started fetching them are fetched and merged into it, and the whole project is fetched again if the merged issues do not match
+        the number of issues in the Redmine server, e.g. when issues were deleted or moved to another project.
+
+        :param projects: Name and ID of the projects to fetch issues from. The dictionary is not modified.
+        :param tracker_id: Tracker ID to filter issues by (optional).
+        :param include: List of associated data to be requested along with the issues, e.g. ["journals"] (optional).
+        :param tracker_names: List of tracker names to be parsed, issues from other trackers are skipped (optional).
+        :return: Dictionary with the list of parsed issue data of each project, by project name.
+        :raise: Exception if an error occurs different from AttributeError.
+        """
+        global TEST_MODE, TEST_LENGTH, MAX_WORKERS, ISSUE_CACHE_TTL
         
         try:
-            for project_name, project_id in project.items():
+            # In test mode, only the first projects are fetched
+            if TEST_MODE and len(projects) > TEST_LENGTH:
+                logging.info("Test mode active. Skipping issue data retrieval of the remaining projects.")
+            
+            valid_projects = {}
+            for project_name, project_id in islice(projects.items(), TEST_LENGTH if TEST_MODE else None):
                 if project_id:
-                    logging.info(f"Fetching issues for project: '{project_name}' (ID {project_id})...")
-                    
-                    issue_filter_params = {
-                        "project_id": project_id,
-                        "status_id": "*",
-                        "limit": 1500
-                    }
-                    if tracker_id:
-                        issue_filter_params["tracker_id"] = tracker_id
-                    if include_journals:
-                        issue_filter_params["include"] = "journals"
-                        
-                    issues = self.redmine.issue.filter(**issue_filter_params)
-                    logging.info(f"Found {len(issues)} issues in project: '{project_name}' (ID {project_id}).")
-                
-                    if len(issues) == 1500:
-                        logging.info("Warning: More than 1500 issues found. Consider paginating the results.")
-                
-                    project[project_name]={"id":project_id,"issues":issues}
+                    valid_projects[project_name] = project_id
                 else:
                     logging.warning(f"Invalid project ID {project_id} provided.")
-                    project.pop(project_name,None)
+        except (AttributeError, TypeError):
+            return {}
+        
+        filter_params = {project_name: self.build_issue_filter_params(project_id, tracker_id, include)
+                         for project_name, project_id in valid_projects.items()}
+        cache_names = {project_name: "_".join(["issues", str(project_id), str(tracker_id or "all").replace("|", "-"), *(include or [])])
+                       for project_name, project_id in valid_projects.items()}
+        
+        # Request only the issues updated since the last run for the projects with cached issues.
+        # The cache is rewritten on every run, so its age is measured from the time of the last full fetch, kept in the cache itself
+        now = datetime.datetime.now().timestamp()
+        cached_issues = {}
+        fetched_on = {}
+        query_params = {}
+        for project_name, issue_filter_params in filter_params.items():
+            cache = self.read_cache(cache_names[project_name], ttl=ISSUE_CACHE_TTL)
+            if cache and now - cache.get("fetched_on", 0) > ISSUE_CACHE_TTL:
+                logging.debug(f"Cached issues of project '{project_name}' expired, fetching all issues again.")
+                cache = None
+            if cache and cache["updated_on"]:
+                cached_issues[project_name] = {raw_issue["id"]: raw_issue for raw_issue in cache.pop("issues")}
+                fetched_on[project_name] = cache["fetched_on"]
+                query_params[project_name] = {**issue_filter_params, "updated_on": f">={cache['updated_on']}"}
+            else:
+                query_params[project_name] = issue_filter_params
+        
+        # Take the watermark of each project before its pages are fetched, in the server clock, along with its number of issues
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            watermarks = dict(zip(filter_params, executor.map(self.fetch_issue_watermark, filter_params.values())))
+        
+        raw_issues = self.fetch_raw_issues(query_params)
+        
+        if cached_issues:
+            # Merge the updated issues into the cached ones, replacing the previous version of each issue.
+            # The merged issues are sorted by descending ID, as listed by Redmine, so the rows are in the same order as when fetched in full
+            for project_name, issues in cached_issues.items():
+                logging.info("Merging %d updated issues into %d cached issues for project: '%s' (ID %s).", len(raw_issues[project_name]), len(issues), project_name, valid_projects[project_name])
+                issues.update((raw_issue["id"], raw_issue) for raw_issue in raw_issues[project_name])
+                raw_issues[project_name] = [issues[issue_id] for issue_id in sorted(issues, reverse=True)]
             
-                if TEST_MODE:
-                    test_mode_counter += 1
-                    if test_mode_counter == TEST_LENGTH:
-                        logging.info("Test mode active. Skipping issue data retrieval of the remaining projects.")
-                        return project
-        except AttributeError:
-            project = {"None": 0, "issues": []}
-        except Exception as e:
-            try:
-                logging.error(f"Error fetching issues for project '{project_name}' (ID {project_id}): {e}")
-            except Exception as e:
-                logging.error(f"Error due project item without name or id: {e}")
-            raise
+            # Every updated or new issue was fetched, so any difference in the number of issues is due to issues no longer in the project,
+            # or to issues created or deleted while fetching, which are also handled by fetching the whole project again
+            stale_projects = [project_name for project_name in cached_issues if watermarks[project_name][1] != len(raw_issues[project_name])]
+            if stale_projects:
+                logging.info(f"Cached issues are outdated, fetching all issues again for projects: {stale_projects}.")
+                raw_issues.update(self.fetch_raw_issues({project_name: filter_params[project_name] for project_name in stale_projects}))
+                for project_name in stale_projects:
+                    fetched_on.pop(project_name)
             
-        return project
+            # The merged issues are only referenced by the project lists from here on, so each project is released once parsed
+            del cached_issues
+        
+        # Store the raw issues for the next runs, except for projects with issues whose journals could not be fetched.
+        # The time of the last full fetch is carried over when only the updated issues were merged
+        fetch_journals = "journals" in (include or [])
+        for project_name, issues in raw_issues.items():
+            if fetch_journals and any(raw_issue["journals"] is None for raw_issue in issues):
+                continue
+            self.write_cache(cache_names[project_name], {"updated_on": watermarks[project_name][0], "fetched_on": fetched_on.get(project_name, now), "issues": issues})
+        
+        # Parse the issues of each project, skipping the issues whose tracker was not requested.
+        # The raw issues of each project are released as soon as they are parsed, instead of after all projects
+        if tracker_names is not None:
+            tracker_names = frozenset(tracker_names)
+        fetched_projects = {}
+        for project_name in list(raw_issues):
+            issues = raw_issues.pop(project_name)
+            issues_data = []
+            skipped_trackers = Counter()
+            for raw_issue in issues:
+                tracker_name = raw_issue.get("tracker", {}).get("name")
+                if tracker_names is None or tracker_name in tracker_names:
+                    issues_data.append(self.parse_issue_data(raw_issue, tracker_name, fetch_journals))
+                else:
+                    skipped_trackers[tracker_name] += 1
+            
+            if skipped_trackers:
+                logging.info("Skipped %d issues from other trackers in project: '%s' (ID %s): %s.", skipped_trackers.total(), project_name, valid_projects[project_name], dict(skipped_trackers))
+            
+            fetched_projects[project_name] = issues_data
+            
+        return fetched_projects
 
     # ------------------------------------------------------------------------------------------
     def parse_json_custom_field(self, custom_field_value: str) -> str:
@@ -360,13 +745,18 @@ class RedmineParser:
         :param custom_field: The custom field object to parse.
         :return: Parsed value for the custom field.
         """
+        # Reuse the value parsed for a previous occurrence of the same string
+        try:
+            return self.json_custom_field_cache[custom_field_value]
+        except (KeyError, TypeError):
+            pass
+        
+        raw_custom_field_value = custom_field_value
         try:
             custom_field_json_value = json.loads(custom_field_value)
         except json.JSONDecodeError:
             # Handle special case of near JSON format
-            custom_field_value = custom_field_value.replace('=>', ':')
-            custom_field_value = custom_field_value.replace('"numero"', '"valor"')
-            custom_field_value = custom_field_value.replace('19"LED', '19\\"LED')
+            custom_field_value = self.near_json_pattern.sub(lambda match: self.near_json_fixes[match.group()], custom_field_value)
             try:
                 custom_field_json_value = json.loads(custom_field_value)
             except json.JSONDecodeError:
@@ -378,28 +768,89 @@ class RedmineParser:
             logging.error(f"Failed to decode custom field '{custom_field_value}': {e}")
             custom_field_json_value = {}
 
-        return custom_field_json_value.get("valor", "")
+        # Share a single copy of each parsed value, also among the values parsed from the journals
+        parsed_value = custom_field_json_value.get("valor", "")
+        if type(parsed_value) is str:
+            parsed_value = self.string_pool.setdefault(parsed_value, parsed_value)
+        if isinstance(raw_custom_field_value, str):
+            self.json_custom_field_cache[raw_custom_field_value] = parsed_value
+        
+        return parsed_value
+
+    # ------------------------------------------------------------------------------------------
+    def parse_date_custom_field(self, custom_field_value: object) -> object:
+        """
+        Converts a raw custom field value to a date or datetime, as done by redminelib when reading resource attributes.
+        The conversion is only attempted on strings starting with a year, avoiding the costly parsing attempts on other values.
+
+        :param custom_field_value: The raw custom field value.
+        :return: The date or datetime represented by the value, or the value itself if it does not represent one.
+        """
+        if not (isinstance(custom_field_value, str) and custom_field_value[:4].isdigit() and custom_field_value[4:5] == '-'):
+            return custom_field_value
+        
+        try:
+            return datetime.datetime.strptime(custom_field_value, self.redmine.datetime_format)
+        except ValueError:
+            pass
+        try:
+            return datetime.datetime.strptime(custom_field_value, self.redmine.date_format).date()
+        except ValueError:
+            return custom_field_value
 
     # ------------------------------------------------------------------------------------------
-    def parse_calibration_historical_data(self, journals: object, issue_id: str) -> dict:
+    def parse_custom_field_value(self, custom_field_value: object) -> object:
+        """
+        Parses a raw custom field value, dispatching on its type.
+        Multiple values are joined in a single string, parsing the items in JSON format. Single values in JSON format are parsed,
+        and the remaining ones are converted to a date or datetime when they represent one.
+        
+        :param custom_field_value: The raw custom field value.
+        :return: Parsed value for the custom field.
+        """
+        value_type = type(custom_field_value)
+        if value_type is str:
+            if custom_field_value[:1] == '{':
+                return self.parse_json_custom_field(custom_field_value)
+            return self.parse_date_custom_field(custom_field_value)
+        
+        if value_type is list:
+            parse_json_custom_field = self.parse_json_custom_field
+            return ', '.join([parse_json_custom_field(item) if type(item) is str and item[:1] == '{' else str(item)
+                              for item in custom_field_value])
+        
+        return self.parse_date_custom_field(custom_field_value)
+    
+    # ------------------------------------------------------------------------------------------
+    def parse_calibration_historical_data(self, journals: list, issue_id: str) -> dict:
         """
         Parses journal data from an issue.
 
-        :param journal: The journal object to parse.
-        :param issue_data: The issue data dictionary to update with parsed values.
+        :param journals: The raw journal data of the issue, as returned by Redmine.
+        :param issue_id: The ID of the issue, used in log messages.
     
         :return: A dictionary containing the parsed journal data.
         """
         global JOURNAL_CAL_DATE_ID, JOURNAL_CAL_CERT_SEI_ID
+        
+        # Bind the field IDs to locals, avoiding global lookups in the loop
+        cal_date_id = JOURNAL_CAL_DATE_ID
+        cal_cert_sei_id = JOURNAL_CAL_CERT_SEI_ID
+        calibration_field_ids = {cal_date_id, cal_cert_sei_id}
+                
+        debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
                 
         issue_data = {}        
         for journal in journals:
-            logging.debug(f"#{issue_id} details: {journal.details}")
+            journal_details = journal.get("details", [])
+            if debug_enabled:
+                logging.debug("#%s details: %s", issue_id, journal_details)
             calibration_date_found = False
             calibration_number_found = False
 
-            for detail in journal.details:
-                if detail['name'] == JOURNAL_CAL_DATE_ID:
+            # Only the calibration fields are relevant, all other changes in the journal are skipped upfront
+            for detail in [detail for detail in journal_details if detail.get('name') in calibration_field_ids]:
+                if detail['name'] == cal_date_id:
                     # Perform a check to ensure the year is valid and get the calibration year
                     calibration_year = detail['old_value'].split('-')[0]
                     if len(calibration_year) != 4:
@@ -411,7 +862,7 @@ class RedmineParser:
                         cal_date_key = f"Data de calibração {calibration_year}"
                         calibration_date_found = True
                     
-                elif detail['name'] == JOURNAL_CAL_CERT_SEI_ID:
+                else:
                     calibration_number = self.parse_json_custom_field(detail['old_value'])
                     
                     if calibration_number == "":
@@ -431,82 +882,117 @@ class RedmineParser:
         return issue_data
     
     # ------------------------------------------------------------------------------------------
-    def parse_issue_data(self, issue) -> dict:
+    def parse_issue_data(self, issue: dict, tracker_name:str = None, parse_journals:bool = True) -> dict:
         """
         Parses issue data and appends it to the appropriate DataFrame based on the issue's tracker name.
+        The issue is read directly from the raw JSON data returned by Redmine, avoiding the creation of redminelib resources.
         
-        :param issue: The issue object to parse.
+        :param issue: The raw issue data to parse.
+        :param tracker_name: Name of the issue tracker, if already known by the caller (optional).
+        :param parse_journals: Flag to parse the calibration history from the issue journals.
         :return: A dictionary containing the parsed issue data.
         """
         
+        issue_id = issue.get("id")
+        issue_data = {"id": issue_id}
         try:
-            # Parse mandatory fields from the issue
+            if tracker_name is None:
+                tracker_name = issue["tracker"]["name"]
+            
+            # Parse mandatory fields from the issue, converting dates in the subject as done by redminelib.
+            # Names repeated in every issue are interned, so all parsed issues share a single copy of each
             issue_data = {
-                "id": issue.id,
-                "Tipo (tracker)": issue.tracker.name,
-                "Situação (status)": issue.status.name,
-                "Título (subject)": issue.subject
+                "id": issue_id,
+                "Tipo (tracker)": sys.intern(tracker_name),
+                "Situação (status)": sys.intern(issue["status"]["name"]),
+                "Título (subject)": self.parse_date_custom_field(issue["subject"])
             }
 
-            # Parse custom fields
-            for custom_field in issue.custom_fields:
-                if isinstance(custom_field.value, list):
-                    parsed_values = []
-                    for item in custom_field.value:
-                        if str(item).startswith('{'):
-                            parsed_values.append(self.parse_json_custom_field(item))
-                        else:
-                            parsed_values.append(item)
-                    parsed_custom_field_value = ', '.join(parsed_values)
-                else:
-                    if str(custom_field.value).startswith('{'):
-                        parsed_custom_field_value = self.parse_json_custom_field(custom_field.value)
-                    else:
-                        parsed_custom_field_value = custom_field.value
+            # Parse custom fields, sharing a single copy of each repeated text value.
+            # Attributes and functions used in the loop are bound to locals, avoiding repeated lookups
+            string_pool = self.string_pool
+            custom_fields_codes = self.custom_fields_codes
+            parse_custom_field_value = self.parse_custom_field_value
+            intern = sys.intern
+            for custom_field in issue.get("custom_fields", []):
+                custom_field_name = intern(custom_field["name"])
+                custom_field_value = parse_custom_field_value(custom_field.get("value", ""))
+                if type(custom_field_value) is str:
+                    custom_field_value = string_pool.setdefault(custom_field_value, custom_field_value)
+                issue_data[custom_field_name] = custom_field_value
                 
-                issue_data[custom_field.name] = parsed_custom_field_value
-                self.custom_fields_codes[custom_field.id] = custom_field.name
+                # The codes converge to a small fixed set after the first issues, so only new codes are stored
+                custom_field_id = custom_field["id"]
+                if custom_field_id not in custom_fields_codes:
+                    custom_fields_codes[custom_field_id] = custom_field_name
             
-            # Parse historical calibration data from journals, if journals exist
-            if issue.journals.total_count:
-                issue_data.update(self.parse_calibration_historical_data(issue.journals, issue_data["id"]))
+            # Parse historical calibration data from journals, if requested and journals exist.
+            # Journals that could not be fetched along with the issue list are requested again
+            if parse_journals:
+                journals = issue.get("journals")
+                if journals is None:
+                    journals = self.fetch_issue_journals(issue_id)
+                if journals:
+                    issue_data.update(self.parse_calibration_historical_data(journals, issue_id))
                 
+        except KeyError as e:
+            # If missing attributes in RedMine data, skip the remaining fields of the issue
+            logging.debug("Missing attribute %s in issue: '%s' (ID %s)", e, tracker_name, issue_id)
         except Exception as e:
-            # If missing attributes in RedMine data, skip the issue
-            if type(e).__name__ != "ResourceAttrError":
-                logging.warning(f"Error processing issue: '{issue.tracker.name}' (ID {issue.id}): {e}")
+            logging.warning("Error processing issue: '%s' (ID %s): %s", tracker_name, issue_id, e)
 
         return issue_data
 
+    # ------------------------------------------------------------------------------------------
+    def build_dataframe(self, rows: list) -> pd.DataFrame:
+        """
+        Builds a DataFrame from a list of parsed issue data, in a single pass.
+
+        :param rows: List of dictionaries with the parsed issue data.
+        :return: DataFrame with the base issue columns first, followed by the remaining columns in order of appearance.
+        """
+        global ISSUE_BASE_COLUMNS, CATEGORICAL_COLUMNS, CATEGORICAL_MAX_UNIQUE_RATIO
+        
+        # Set the columns explicitly, so pandas does not need to infer them from each record
+        columns = list(dict.fromkeys(ISSUE_BASE_COLUMNS + [key for row in rows for key in row]))
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        
+        # Store the text columns with repeated values, such as brands, models and categories, as categories,
+        # keeping a single copy of each distinct string
+        max_unique_values = CATEGORICAL_MAX_UNIQUE_RATIO * len(df)
+        for column in df.columns:
+            if column in CATEGORICAL_COLUMNS or (pd.api.types.infer_dtype(df[column], skipna=True) == "string"
+                                                 and df[column].nunique() <= max_unique_values):
+                df[column] = df[column].astype("category")
+        
+        return df
+    
     # ------------------------------------------------------------------------------------------
     def process_general_register(self) -> None:
         """
         Processes the 'Cadastro-instrumentos' project by fetching its issues and appending them to the appropriate DataFrame.
         """
         
-        global PRJ_INSTR_GENERAL_REGISTER
-        
-        skipped_count = 0
-        processed_count = 0
+        global PRJ_INSTR_GENERAL_REGISTER, GR_ISSUE_TRACKER_NAMES, GR_ISSUE_INCLUDE
         
         try:
-            # Fetch issues for the 'Cadastro-instrumentos' project
-            self.gr_project_data = self.fetch_issues_by_project(self.gr_project_data, include_journals=False)
-        
-            # Process each issue and store it in the appropriate DataFrame
-            for issue in self.gr_project_data[PRJ_INSTR_GENERAL_REGISTER]["issues"]:
-                issue_data = self.parse_issue_data(issue)
-                try:
-                    # Append the issue data to the appropriate DataFrame
-                    self.gr_df_dict[issue.tracker.name] = pd.concat([   self.gr_df_dict[issue.tracker.name],
-                                                                        pd.DataFrame([issue_data])],
-                                                                        ignore_index=True)
-                    processed_count += 1
-                except KeyError:
-                    logging.debug(f"Tracker '{issue.tracker.name}' not found in DataFrame dictionary. Skipping issue ID {issue.id}.")
-                    skipped_count += 1
+            # Fetch and parse the issues of the 'Cadastro-instrumentos' project, filtering the general register trackers on the server
+            # and keeping the local filter for the case where the tracker IDs could not be resolved
+            tracker_id = self.fetch_tracker_ids(GR_ISSUE_TRACKER_NAMES) if self.gr_project_data else None
+            gr_issues = self.fetch_issues_by_project(self.gr_project_data, tracker_id=tracker_id, include=GR_ISSUE_INCLUDE, tracker_names=GR_ISSUE_TRACKER_NAMES)[PRJ_INSTR_GENERAL_REGISTER]
+        
+            # Collect the parsed issues in one list per tracker, building each DataFrame only once at the end.
+            # The full list is dropped after routing, so the parsed dictionaries of each tracker are released once its DataFrame is built
+            rows_by_tracker: defaultdict[str, list[dict]] = defaultdict(list)
+            for issue_data in gr_issues:
+                rows_by_tracker[issue_data["Tipo (tracker)"]].append(issue_data)
+            gr_issue_count = len(gr_issues)
+            del gr_issues
+            
+            self.gr_df_dict = {tracker: self.build_dataframe(rows_by_tracker.pop(tracker)) for tracker in GR_ISSUE_TRACKER_NAMES
+                               if tracker in rows_by_tracker}
                     
-            logging.info(f"Processed {processed_count} issues, skipped {skipped_count} from the general register.")
+            logging.info(f"Processed {gr_issue_count} issues from the general register.")
         except KeyError:
             return
 
@@ -516,72 +1002,163 @@ class RedmineParser:
         Processes the equipment data by fetching issues from the projects with the associated equipment tracker and appending them to the DataFrame.
         """
         
-        global TEST_MODE, TEST_LENGTH, PRJ_INSTR_GENERAL_REGISTER, EQUIPMENT_TRACKER_ID
+        global PRJ_INSTR_GENERAL_REGISTER, EQUIPMENT_TRACKER_ID, EQUIPMENT_ISSUE_INCLUDE
         
-        test_mode_counter = 0
+        instr_rows: list[dict] = []
         try:
-            # Fetch issues for the equipment projects
-            self.equipment_projects_data = self.fetch_issues_by_project(self.equipment_projects_data, tracker_id=EQUIPMENT_TRACKER_ID)
+            # Fetch and parse issues for the equipment projects, limited to the first projects in test mode
+            issues_by_project = self.fetch_issues_by_project(self.equipment_projects_data, tracker_id=EQUIPMENT_TRACKER_ID, include=EQUIPMENT_ISSUE_INCLUDE)
             
-            # Process each issue and store it in the appropriate DataFrame
-            for project_name, project in self.equipment_projects_data.items():
-                logging.info(f"Processing issues for project: '{project_name}' (ID {project['id']})...")
-                
-                # Process each issue and store it in the appropriate DataFrame
-                for issue in project["issues"]:
-                    issue_data = self.parse_issue_data(issue)
-                    self.instr_df = pd.concat([self.instr_df, pd.DataFrame([issue_data])], ignore_index=True)
-                    
-                logging.debug(f"Custom codes in Project '{project_name}' (ID {project['id']}): {json.dumps(self.custom_fields_codes, indent=4)}")
-                    
-                if TEST_MODE:
-                    test_mode_counter += 1
-                    if test_mode_counter == TEST_LENGTH:
-                        logging.info("Test mode active. Skipping data processing.")
-                        return
+            # Collect the parsed data for the equipment DataFrame
+            for project_name, issues in issues_by_project.items():
+                logging.info("Processing issues for project: '%s' (ID %s)...", project_name, self.equipment_projects_data[project_name])
+                instr_rows.extend(issues)
+            
+            # Release the per project lists, so the parsed dictionaries are only referenced by the rows of the DataFrame
+            del issues_by_project
+            
+            # The custom field codes are shared by all projects, so they are serialized once, and only when debug messages are shown
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"Custom field codes: {json.dumps(self.custom_fields_codes, indent=4)}")
         
         except KeyError:
             logging.error(f"Project '{PRJ_INSTR_GENERAL_REGISTER}' not found in the fetched projects.")
-            return
         
+        # Build the equipment DataFrame once from all collected rows
+        self.instr_df = self.build_dataframe(instr_rows)
+        
+    # ------------------------------------------------------------------------------------------
+    def write_sheet(self, workbook: Workbook, sheet_name: str, df: pd.DataFrame, index:bool = False) -> None:
+        """
+        Writes a DataFrame to a new sheet of a write-only workbook, streaming the rows in chunks.
+        
+        :param workbook: Write-only workbook to add the sheet to.
+        :param sheet_name: Name of the sheet.
+        :param df: DataFrame to be written, with its column names as header.
+        :param index: Flag to write the DataFrame index as the first column.
+        """
+        
+        if index:
+            df = df.reset_index()
+        
+        worksheet = workbook.create_sheet(sheet_name)
+        worksheet.freeze_panes = "A2"
+        
+        header_font = Font(bold=True)
+        header = []
+        for column in df.columns:
+            cell = WriteOnlyCell(worksheet, value=column)
+            cell.font = header_font
+            header.append(cell)
+        worksheet.append(header)
+        
+        # Convert the values to Python objects one chunk at a time, writing missing values as empty cells
+        chunk_size = 1000
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size].astype(object)
+            for row in chunk.where(chunk.notna(), None).itertuples(index=False, name=None):
+                worksheet.append(row)
+    
     # ------------------------------------------------------------------------------------------
-    def save_data_to_file(self) -> None:
+    def save_data_to_file(self) -> Path:
         """
-        Saves the DataFrames to an Excel file in the specified output directory.
+        Saves the DataFrames to the specified output directory, in the format set by OUTPUT_FORMAT.
+        As an Excel file, the workbook is written in write-only mode, so rows are streamed to the file instead of being kept in memory as cells.
+        As CSV, each DataFrame is saved to a separate file, in a folder named as the Excel file would be.
+        
+        :return: Path to the Excel file, or to the folder with the CSV files.
         """
-        global OUTPUT_PATH, OUTPUT_FILENAME_SUFFIX
+        global OUTPUT_PATH, OUTPUT_FILENAME_SUFFIX, OUTPUT_FORMAT
         
         # create the filename adding a timestamp to the filename
         now = datetime.datetime.now()
-        filename = Path(f"{now.strftime('%Y%m%d_%H%M%S')}_{OUTPUT_FILENAME_SUFFIX}.xlsx")
+        filename = Path(f"{now.strftime('%Y%m%d_%H%M%S')}_{OUTPUT_FILENAME_SUFFIX}")
         
         filename = OUTPUT_PATH / filename
         
-        # Save each DataFrame to a separate sheet in the Excel file
-        with pd.ExcelWriter(filename) as writer:
-            # Save the general register DataFrames
-            for tracker_name, df in self.gr_df_dict.items():
-                if not df.empty:
-                    df.to_excel(writer, sheet_name=tracker_name, index=False)
-            
-            df_projects = pd.DataFrame.from_dict(self.equipment_projects_data, orient='index', columns=['Project ID'])
-            df_projects.index.name = 'Project Name'
-            df_projects.to_excel(writer, sheet_name="Projects", index=True)
-            
-            df_cfc = pd.DataFrame.from_dict(self.custom_fields_codes, orient='index', columns=['Custom Field Name'])
-            df_cfc.index.name = 'Custom Field ID'
-            df_cfc.to_excel(writer, sheet_name="Custom Field Codes", index=True)
-            
-            # Save the equipment DataFrame
-            self.instr_df.to_excel(writer, sheet_name=PROJECT_NAME_KEYWORD, index=False)
-            
-
+        # Collect the tables to be saved, with the name of each sheet or file and the flag to save its index
+        tables = []
+        
+        # Save the general register DataFrames
+        for tracker_name, df in self.gr_df_dict.items():
+            if not df.empty:
+                tables.append((tracker_name, df, False))
+        
+        df_projects = pd.DataFrame.from_dict(self.equipment_projects_data, orient='index', columns=['Project ID'])
+        df_projects.index.name = 'Project Name'
+        tables.append(("Projects", df_projects, True))
+        
+        df_cfc = pd.DataFrame.from_dict(self.custom_fields_codes, orient='index', columns=['Custom Field Name'])
+        df_cfc.index.name = 'Custom Field ID'
+        tables.append(("Custom Field Codes", df_cfc, True))
+        
+        # Save the equipment DataFrame
+        tables.append((PROJECT_NAME_KEYWORD, self.instr_df, False))
+        
+        if OUTPUT_FORMAT == "csv":
+            # Save each DataFrame to a separate CSV file, with a byte order mark so that Excel detects the UTF-8 encoding
+            filename.mkdir(parents=True, exist_ok=True)
+            for table_name, df, index in tables:
+                df.to_csv(filename / f"{table_name}.csv", index=index, encoding="utf-8-sig")
+        else:
+            # Save each DataFrame to a separate sheet in the Excel file
+            filename = filename.with_name(f"{filename.name}.xlsx")
+            workbook = Workbook(write_only=True)
+            for table_name, df, index in tables:
+                self.write_sheet(workbook, table_name, df, index=index)
+            workbook.save(filename)
         
         return filename
     
 # ----------------------------------------------------------------------------------------------    
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the command line arguments, overriding the corresponding configuration variables.
+    
+    :return: Namespace with the parsed arguments.
+    """
+    
+    global MAX_WORKERS, TEST_MODE, TEST_LENGTH, REDMINE_API_KEY, CACHE_READ, OUTPUT_FORMAT, LOG_LEVEL
+    
+    parser = argparse.ArgumentParser(description="Extract instrument data from Redmine into an Excel file.")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"Maximum number of concurrent requests to the Redmine server. Default is {MAX_WORKERS}.")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Process only the given number of projects, enabling test mode.")
+    parser.add_argument("--api-key", default=REDMINE_API_KEY,
+                        help="API key used to authenticate in the Redmine server. Default is the REDMINE_API_KEY environment variable.")
+    parser.add_argument("--output-format", choices=["xlsx", "csv"], default=OUTPUT_FORMAT,
+                        help=f"Format of the output, a single Excel file or one CSV file per table. Default is {OUTPUT_FORMAT}.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Fetch all data again from Redmine, ignoring and refreshing the data cached by previous runs.")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default=LOG_LEVEL,
+                        help=f"Minimum level of the log messages to be shown. Default is {LOG_LEVEL}.")
+    args = parser.parse_args()
+    
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    MAX_WORKERS = args.workers
+    
+    if args.limit is not None:
+        if args.limit < 1:
+            parser.error("--limit must be at least 1")
+        TEST_MODE = True
+        TEST_LENGTH = args.limit
+    
+    REDMINE_API_KEY = args.api_key
+    OUTPUT_FORMAT = args.output_format
+    LOG_LEVEL = args.log_level
+    
+    if args.no_cache:
+        CACHE_READ = False
+    
+    return args
+
+# ----------------------------------------------------------------------------------------------
 def main():
     
+    parse_arguments()
+    
     try:
         ui = uiTerminal()
         ui.get_credentials()